@@ -20,94 +20,119 @@ Este docstring añade contexto narrativo al ejemplo: los "ángulos verdaderos" s
 la puntería ideal y los "ángulos disparados" las medidas reales con ruido y sesgo.
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import math
-import random
-import statistics
-from typing import List, Tuple
-
-import matplotlib
-matplotlib.use('Agg')  # por defecto generar archivos (no bloquear)
-import matplotlib.pyplot as plt
-
-try:
-	import tkinter as tk
-	from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-	TK_AVAILABLE = True
-except Exception:
-	TK_AVAILABLE = False
-
-
-def compute_errors(true_vals: List[float], approx_vals: List[float]) -> Tuple[List[float], List[float]]:
-	abs_errs = []
-	rel_errs = []
-	for t, a in zip(true_vals, approx_vals):
-		ea = abs(t - a)
-		er = ea / abs(t) if t != 0 else float('inf')
-		abs_errs.append(ea)
-		rel_errs.append(er)
+
+import numpy as np
+
+from _common import NUMBA_MIN_SIZE, generate_noisy, load_compute_errors_kernel, load_pyplot, save_figure
+
+# Resolución de los PNG generados por save_plots
+SAVE_DPI = 96
+
+# Directorios de salida ya creados en este proceso
+_MKDIR_CACHE = set()
+
+
+def _ensure_dir(out_dir: str):
+	# Evita repetir makedirs (stat/mkdir) si save_plots se llama varias veces
+	if out_dir not in _MKDIR_CACHE:
+		os.makedirs(out_dir, exist_ok=True)
+		_MKDIR_CACHE.add(out_dir)
+
+
+def compute_errors(true_vals: list[float], approx_vals: list[float]) -> tuple[np.ndarray, np.ndarray]:
+	t = np.asarray(true_vals, dtype=float)
+	a = np.asarray(approx_vals, dtype=float)
+	if t.ndim == 1 and t.shape == a.shape and t.size >= NUMBA_MIN_SIZE:
+		kernel = load_compute_errors_kernel()
+		if kernel is not None:
+			abs_errs = np.empty_like(t)
+			rel_errs = np.empty_like(t)
+			kernel(t, a, abs_errs, rel_errs)
+			return abs_errs, rel_errs
+	abs_errs = np.abs(t - a)
+	abs_t = np.abs(t)
+	# División directa (no producto por 1/|t|: el recíproco de un |t| subnormal
+	# desborda a inf); donde t == 0 queda el inf inicial
+	rel_errs = np.divide(abs_errs, abs_t, out=np.full_like(abs_t, np.inf), where=abs_t != 0)
 	return abs_errs, rel_errs
 
 
-def save_plots(true_vals: List[float], approx_vals: List[float], abs_errs: List[float], out_dir: str):
-	os.makedirs(out_dir, exist_ok=True)
+def save_plots(true_vals: list[float], approx_vals: list[float], abs_errs: list[float], out_dir: str):
+	plt = load_pyplot()
+	_ensure_dir(out_dir)
+
+	# Una sola figura para todos los gráficos: se limpia el eje entre uno y otro
+	fig, ax = plt.subplots(figsize=(6, 4), dpi=SAVE_DPI)
+	# Márgenes fijos en lugar de tight_layout (evita una pasada extra de dibujo)
+	fig.subplots_adjust(left=0.12, right=0.97, top=0.90, bottom=0.17)
 
 	# Scatter: verdadero vs aproximado
-	fig1, ax1 = plt.subplots(figsize=(6, 4))
-	ax1.scatter(true_vals, approx_vals, color='tab:blue')
-	ax1.plot([min(true_vals), max(true_vals)], [min(true_vals), max(true_vals)], '--', color='gray')
-	ax1.set_xlabel('Ángulo verdadero (°)')
-	ax1.set_ylabel('Ángulo disparado (°)')
-	ax1.set_title('Ángulo verdadero vs Ángulo disparado')
-	fig1.tight_layout()
-	fig1.savefig(os.path.join(out_dir, 'scatter_true_vs_approx.png'))
-	plt.close(fig1)
+	ax.plot(true_vals, approx_vals, 'o', color='tab:blue')
+	ax.plot([min(true_vals), max(true_vals)], [min(true_vals), max(true_vals)], '--', color='gray')
+	ax.set_xlabel('Ángulo verdadero (°)')
+	ax.set_ylabel('Ángulo disparado (°)')
+	ax.set_title('Ángulo verdadero vs Ángulo disparado')
+	save_figure(fig, os.path.join(out_dir, 'scatter_true_vs_approx.png'))
 
 	# Error por tiro
-	fig2, ax2 = plt.subplots(figsize=(6, 3))
-	ax2.plot(range(1, len(abs_errs) + 1), abs_errs, marker='o')
-	ax2.set_xlabel('Disparo #')
-	ax2.set_ylabel('Error absoluto (°)')
-	ax2.set_title('Error absoluto por disparo')
-	fig2.tight_layout()
-	fig2.savefig(os.path.join(out_dir, 'error_by_shot.png'))
-	plt.close(fig2)
+	ax.clear()
+	fig.set_size_inches(6, 3)
+	ax.plot(range(1, len(abs_errs) + 1), abs_errs, marker='o')
+	ax.set_xlabel('Disparo #')
+	ax.set_ylabel('Error absoluto (°)')
+	ax.set_title('Error absoluto por disparo')
+	save_figure(fig, os.path.join(out_dir, 'error_by_shot.png'))
 
 	# Histograma de errores
-	fig3, ax3 = plt.subplots(figsize=(6, 3))
-	ax3.hist(abs_errs, bins=8, color='tab:orange', edgecolor='black')
-	ax3.set_xlabel('Error absoluto (°)')
-	ax3.set_ylabel('Frecuencia')
-	ax3.set_title('Histograma de errores absolutos')
-	fig3.tight_layout()
-	fig3.savefig(os.path.join(out_dir, 'hist_errors.png'))
-	plt.close(fig3)
-
-
-def print_summary(true_vals: List[float], approx_vals: List[float], abs_errs: List[float], rel_errs: List[float]):
-	print('\nResumen de errores:')
-	print('-------------------')
-	print(f'Tiros totales: {len(true_vals)}')
-	print(f'Error absoluto medio: {statistics.mean(abs_errs):.4f} °')
-	print(f'Error absoluto máximo: {max(abs_errs):.4f} °')
-	print(f'Error relativo medio: {statistics.mean(rel_errs) * 100:.4f} %')
-	print('\nTabla (primeras 12 filas):')
-	print('i | verdadero(°) | disparado(°) | err_abs(°) | err_rel(%)')
-	for i, (t, a, ea, er) in enumerate(zip(true_vals, approx_vals, abs_errs, rel_errs), start=1):
-		print(f'{i:2d} | {t:12.4f} | {a:12.4f} | {ea:9.4f} | {er*100:9.4f}')
-
-
-def run_gui(true_vals: List[float], approx_vals: List[float], abs_errs: List[float]):
-	if not TK_AVAILABLE:
+	ax.clear()
+	counts, edges = np.histogram(abs_errs, bins=8)
+	ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='tab:orange', edgecolor='black')
+	ax.set_xlabel('Error absoluto (°)')
+	ax.set_ylabel('Frecuencia')
+	ax.set_title('Histograma de errores absolutos')
+	save_figure(fig, os.path.join(out_dir, 'hist_errors.png'))
+	plt.close(fig)
+
+
+def print_summary(true_vals: list[float], approx_vals: list[float], abs_errs: list[float], rel_errs: list[float]):
+	abs_errs = np.asarray(abs_errs, dtype=float)
+	rel_errs = np.asarray(rel_errs, dtype=float)
+	# Encabezado y estadísticas en una sola escritura
+	lines = [
+		'\nResumen de errores:',
+		'-------------------',
+		f'Tiros totales: {len(true_vals)}',
+		f'Error absoluto medio: {float(abs_errs.mean()):.4f} °',
+		f'Error absoluto máximo: {float(abs_errs.max()):.4f} °',
+		f'Error relativo medio: {float(rel_errs.mean()) * 100:.4f} %',
+		'\nTabla (primeras 12 filas):',
+		'i | verdadero(°) | disparado(°) | err_abs(°) | err_rel(%)',
+	]
+	sys.stdout.write('\n'.join(lines) + '\n')
+	# Filas de la tabla: un solo np.savetxt en lugar de formatear fila por fila
+	table = np.column_stack([np.arange(1, len(true_vals) + 1), true_vals, approx_vals, abs_errs, rel_errs * 100])
+	np.savetxt(sys.stdout, table, fmt='%2d | %12.4f | %12.4f | %9.4f | %9.4f')
+
+
+def run_gui(true_vals: list[float], approx_vals: list[float], abs_errs: list[float]):
+	try:
+		import tkinter as tk
+		from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+	except Exception:
 		print('tkinter no está disponible en este entorno; no se puede abrir GUI.')
 		return
+	plt = load_pyplot()
+	abs_errs = np.asarray(abs_errs, dtype=float)
 
 	root = tk.Tk()
 	root.title('Análisis de errores - Artillería')
 
 	fig, ax = plt.subplots(figsize=(6, 4))
-	ax.scatter(true_vals, approx_vals, color='tab:blue')
+	ax.plot(true_vals, approx_vals, 'o', color='tab:blue')
 	ax.plot([min(true_vals), max(true_vals)], [min(true_vals), max(true_vals)], '--', color='gray')
 	ax.set_xlabel('Ángulo verdadero (°)')
 	ax.set_ylabel('Ángulo disparado (°)')
@@ -117,7 +142,7 @@ def run_gui(true_vals: List[float], approx_vals: List[float], abs_errs: List[flo
 	canvas.draw()
 	canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
 
-	stats_txt = f'Errores absol. medios: {statistics.mean(abs_errs):.4f} °\nMax: {max(abs_errs):.4f} °'
+	stats_txt = f'Errores absol. medios: {float(abs_errs.mean()):.4f} °\nMax: {float(abs_errs.max()):.4f} °'
 	label = tk.Label(root, text=stats_txt, justify=tk.LEFT)
 	label.pack(side=tk.BOTTOM, fill=tk.X)
 
@@ -125,8 +150,6 @@ def run_gui(true_vals: List[float], approx_vals: List[float], abs_errs: List[flo
 
 
 def main(argv):
-	random.seed(42)
-
 	# Dataset: ángulos verdaderos (°) hacia el blanco y disparos del artillero
 	# (Se usan 12 datos para observación)
 	true_angles = [45.0, 46.0, 44.5, 45.2, 45.8, 44.9, 46.4, 45.1, 45.5, 44.7, 46.2, 45.3]
@@ -135,7 +158,7 @@ def main(argv):
 	# Aquí el error simulado en grados (ruido gaussiano con sigma=1.2°) + un sesgo pequeño
 	sigma = 1.2
 	bias = 0.3
-	approx_angles = [t + bias + random.gauss(0, sigma) for t in true_angles]
+	approx_angles = generate_noisy(true_angles, bias, sigma, seed=42)
 
 	abs_errs, rel_errs = compute_errors(true_angles, approx_angles)
 
@@ -20,93 +20,110 @@ usando fórmulas físicas básicas y medidas simuladas.
 
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import math
-import random
-import statistics
-from typing import List, Dict, Tuple
 
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+import numpy as np
+
+from _common import NUMBA_MIN_SIZE, generate_noisy, load_compute_errors_kernel, load_pyplot, save_figure
 
-try:
-	import tkinter as tk
-	from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-	TK_AVAILABLE = True
-except Exception:
-	TK_AVAILABLE = False
+# Resolución de los PNG generados por save_plots
+SAVE_DPI = 96
+
+# Directorios de salida ya creados en este proceso
+_MKDIR_CACHE = set()
 
 
 def range_projectile(v: float, angle_deg: float, g: float = 9.81) -> float:
-	theta = math.radians(angle_deg)
-	return (v * v) * math.sin(2 * theta) / g
-
-
-def compute_errors(true_vals: List[float], approx_vals: List[float]) -> Tuple[List[float], List[float]]:
-	abs_errs = []
-	rel_errs = []
-	for t, a in zip(true_vals, approx_vals):
-		ea = abs(t - a)
-		er = ea / abs(t) if t != 0 else float('inf')
-		abs_errs.append(ea)
-		rel_errs.append(er)
+	theta = np.radians(angle_deg)
+	return (v * v) * np.sin(2 * theta) / g
+
+
+def _ensure_dir(out_dir: str):
+	# Evita repetir makedirs (stat/mkdir) si save_plots se llama varias veces
+	if out_dir not in _MKDIR_CACHE:
+		os.makedirs(out_dir, exist_ok=True)
+		_MKDIR_CACHE.add(out_dir)
+
+
+def compute_errors(true_vals: list[float], approx_vals: list[float]) -> tuple[np.ndarray, np.ndarray]:
+	t = np.asarray(true_vals, dtype=float)
+	a = np.asarray(approx_vals, dtype=float)
+	if t.ndim == 1 and t.shape == a.shape and t.size >= NUMBA_MIN_SIZE:
+		kernel = load_compute_errors_kernel()
+		if kernel is not None:
+			abs_errs = np.empty_like(t)
+			rel_errs = np.empty_like(t)
+			kernel(t, a, abs_errs, rel_errs)
+			return abs_errs, rel_errs
+	abs_errs = np.abs(t - a)
+	abs_t = np.abs(t)
+	# División directa (no producto por 1/|t|: el recíproco de un |t| subnormal
+	# desborda a inf); donde t == 0 queda el inf inicial
+	rel_errs = np.divide(abs_errs, abs_t, out=np.full_like(abs_t, np.inf), where=abs_t != 0)
 	return abs_errs, rel_errs
 
 
-def save_plots(data: List[Dict], out_dir: str):
-	os.makedirs(out_dir, exist_ok=True)
+def save_plots(data: dict[str, np.ndarray], out_dir: str):
+	plt = load_pyplot()
+	_ensure_dir(out_dir)
+
+	true_ranges = data['true_range']
+	meas_ranges = data['measured_range']
+	abs_errs = data['abs_err']
 
-	true_ranges = [d['true_range'] for d in data]
-	meas_ranges = [d['measured_range'] for d in data]
-	abs_errs = [d['abs_err'] for d in data]
+	# Una sola figura para todos los gráficos: se limpia el eje entre uno y otro
+	fig, ax = plt.subplots(figsize=(6, 4), dpi=SAVE_DPI)
+	# Márgenes fijos en lugar de tight_layout (evita una pasada extra de dibujo)
+	fig.subplots_adjust(left=0.12, right=0.97, top=0.90, bottom=0.17)
 
 	# Scatter true vs medido
-	fig1, ax1 = plt.subplots(figsize=(6, 4))
-	ax1.scatter(true_ranges, meas_ranges, color='tab:green')
-	ax1.plot([min(true_ranges), max(true_ranges)], [min(true_ranges), max(true_ranges)], '--', color='gray')
-	ax1.set_xlabel('Alcance teórico (m)')
-	ax1.set_ylabel('Alcance medido (m)')
-	ax1.set_title('Alcance teórico vs medido')
-	fig1.tight_layout()
-	fig1.savefig(os.path.join(out_dir, 'scatter_range.png'))
-	plt.close(fig1)
+	ax.plot(true_ranges, meas_ranges, 'o', color='tab:green')
+	ax.plot([true_ranges.min(), true_ranges.max()], [true_ranges.min(), true_ranges.max()], '--', color='gray')
+	ax.set_xlabel('Alcance teórico (m)')
+	ax.set_ylabel('Alcance medido (m)')
+	ax.set_title('Alcance teórico vs medido')
+	save_figure(fig, os.path.join(out_dir, 'scatter_range.png'))
 
 	# Error por disparo
-	fig2, ax2 = plt.subplots(figsize=(6, 3))
-	ax2.plot(range(1, len(abs_errs) + 1), abs_errs, marker='o', color='tab:red')
-	ax2.set_xlabel('Disparo #')
-	ax2.set_ylabel('Error absoluto (m)')
-	ax2.set_title('Error absoluto por disparo')
-	fig2.tight_layout()
-	fig2.savefig(os.path.join(out_dir, 'abs_error_by_shot.png'))
-	plt.close(fig2)
+	ax.clear()
+	fig.set_size_inches(6, 3)
+	ax.plot(range(1, len(abs_errs) + 1), abs_errs, marker='o', color='tab:red')
+	ax.set_xlabel('Disparo #')
+	ax.set_ylabel('Error absoluto (m)')
+	ax.set_title('Error absoluto por disparo')
+	save_figure(fig, os.path.join(out_dir, 'abs_error_by_shot.png'))
 
 	# Histograma
-	fig3, ax3 = plt.subplots(figsize=(6, 3))
-	ax3.hist(abs_errs, bins=6, color='tab:orange', edgecolor='black')
-	ax3.set_xlabel('Error absoluto (m)')
-	ax3.set_ylabel('Frecuencia')
-	ax3.set_title('Histograma errores absolutos')
-	fig3.tight_layout()
-	fig3.savefig(os.path.join(out_dir, 'hist_abs_errors.png'))
-	plt.close(fig3)
-
-
-def run_gui(data: List[Dict]):
-	if not TK_AVAILABLE:
+	ax.clear()
+	counts, edges = np.histogram(abs_errs, bins=6)
+	ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='tab:orange', edgecolor='black')
+	ax.set_xlabel('Error absoluto (m)')
+	ax.set_ylabel('Frecuencia')
+	ax.set_title('Histograma errores absolutos')
+	save_figure(fig, os.path.join(out_dir, 'hist_abs_errors.png'))
+	plt.close(fig)
+
+
+def run_gui(data: dict[str, np.ndarray]):
+	try:
+		import tkinter as tk
+		from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+	except Exception:
 		print('tkinter no está disponible; modo GUI no habilitado.')
 		return
-	true_ranges = [d['true_range'] for d in data]
-	meas_ranges = [d['measured_range'] for d in data]
+	plt = load_pyplot()
+	true_ranges = data['true_range']
+	meas_ranges = data['measured_range']
 
 	root = tk.Tk()
 	root.title('Caída de balas - Análisis de errores')
 
 	fig, ax = plt.subplots(figsize=(6, 4))
-	ax.scatter(true_ranges, meas_ranges, color='tab:green')
-	ax.plot([min(true_ranges), max(true_ranges)], [min(true_ranges), max(true_ranges)], '--', color='gray')
+	ax.plot(true_ranges, meas_ranges, 'o', color='tab:green')
+	ax.plot([true_ranges.min(), true_ranges.max()], [true_ranges.min(), true_ranges.max()], '--', color='gray')
 	ax.set_xlabel('Alcance teórico (m)')
 	ax.set_ylabel('Alcance medido (m)')
 	ax.set_title('Alcance teórico vs medido')
@@ -115,7 +132,7 @@ def run_gui(data: List[Dict]):
 	canvas.draw()
 	canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
 
-	mean_abs = statistics.mean([d['abs_err'] for d in data])
+	mean_abs = float(data['abs_err'].mean())
 	txt = f'Error absoluto medio: {mean_abs:.3f} m'
 	lbl = tk.Label(root, text=txt)
 	lbl.pack(side=tk.BOTTOM, fill=tk.X)
@@ -124,8 +141,6 @@ def run_gui(data: List[Dict]):
 
 
 def main(argv):
-	random.seed(1)
-
 	# Parámetros de la simulación
 	v0 = 200.0  # velocidad inicial m/s (ejemplo)
 	true_angle = 30.0  # grados
@@ -133,40 +148,42 @@ def main(argv):
 	n_shots = 10
 
 	# Generar disparos: el tirador intenta `true_angle` pero comete errores
-	shots: List[Dict] = []
-	for i in range(n_shots):
-		measured_angle = true_angle + random.gauss(0, sigma_deg)
-		true_r = range_projectile(v0, true_angle)
-		meas_r = range_projectile(v0, measured_angle)
-		# Calcular errores según README
-		ea = abs(true_r - meas_r)
-		er = ea / abs(true_r) if true_r != 0 else float('inf')
-		shots.append({
-			'shot': i + 1,
-			'true_angle': true_angle,
-			'measured_angle': measured_angle,
-			'true_range': true_r,
-			'measured_range': meas_r,
-			'abs_err': ea,
-			'rel_err': er,
-		})
+	# (una columna por magnitud, un elemento por disparo)
+	measured_angles = generate_noisy(np.full(n_shots, true_angle), 0.0, sigma_deg, seed=1)
+	meas_ranges = range_projectile(v0, measured_angles)
+	# El alcance teórico es el mismo para todos los disparos: se calcula una vez
+	true_r = range_projectile(v0, true_angle)
+	true_ranges = np.full(n_shots, true_r)
+	# Calcular errores según README
+	abs_errs, rel_errs = compute_errors(true_ranges, meas_ranges)
+	shots: dict[str, np.ndarray] = {
+		'shot': np.arange(1, n_shots + 1),
+		'true_angle': np.full(n_shots, true_angle),
+		'measured_angle': measured_angles,
+		'true_range': true_ranges,
+		'measured_range': meas_ranges,
+		'abs_err': abs_errs,
+		'rel_err': rel_errs,
+	}
 
 	out_dir = os.path.join(os.path.dirname(__file__), 'output_ej2')
 	save_plots(shots, out_dir)
 
-	# Imprimir resumen
-	abs_errs = [s['abs_err'] for s in shots]
-	rel_errs = [s['rel_err'] for s in shots]
-	print('\nResumen Ejemplo 2 - Caída de balas')
-	print('--------------------------------')
-	print(f'Tiros: {n_shots}')
-	print(f'Error absoluto medio: {statistics.mean(abs_errs):.4f} m')
-	print(f'Error absoluto máximo: {max(abs_errs):.4f} m')
-	print(f'Error relativo medio: {statistics.mean(rel_errs) * 100:.4f} %')
-	print('\nTabla de disparos:')
-	print('i | ang_true(°) | ang_med(°) | rango_true(m) | rango_med(m) | err_abs(m) | err_rel(%)')
-	for s in shots:
-		print(f"{s['shot']:2d} | {s['true_angle']:11.3f} | {s['measured_angle']:9.3f} | {s['true_range']:13.3f} | {s['measured_range']:11.3f} | {s['abs_err']:9.3f} | {s['rel_err']*100:9.4f}")
+	# Imprimir resumen (encabezado y estadísticas en una sola escritura)
+	lines = [
+		'\nResumen Ejemplo 2 - Caída de balas',
+		'--------------------------------',
+		f'Tiros: {n_shots}',
+		f'Error absoluto medio: {float(abs_errs.mean()):.4f} m',
+		f'Error absoluto máximo: {float(abs_errs.max()):.4f} m',
+		f'Error relativo medio: {float(rel_errs.mean()) * 100:.4f} %',
+		'\nTabla de disparos:',
+		'i | ang_true(°) | ang_med(°) | rango_true(m) | rango_med(m) | err_abs(m) | err_rel(%)',
+	]
+	sys.stdout.write('\n'.join(lines) + '\n')
+	# Filas de la tabla: un solo np.savetxt en lugar de formatear fila por fila
+	table = np.column_stack([shots['shot'], shots['true_angle'], shots['measured_angle'], shots['true_range'], shots['measured_range'], abs_errs, rel_errs * 100])
+	np.savetxt(sys.stdout, table, fmt='%2d | %11.3f | %9.3f | %13.3f | %11.3f | %9.3f | %9.4f')
 
 	if '--gui' in argv:
 		run_gui(shots)
@@ -23,100 +23,120 @@ calcula errores absolutos/relativos y proyecta los impactos en el plano del blan
 para visualizar la dispersión y el posible sesgo sistemático.
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import math
-import random
-import statistics
-from typing import List, Dict, Tuple
-
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-
-try:
-	import tkinter as tk
-	from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-	TK_AVAILABLE = True
-except Exception:
-	TK_AVAILABLE = False
-
-
-def compute_errors(true_vals: List[float], approx_vals: List[float]) -> Tuple[List[float], List[float]]:
-	abs_errs = []
-	rel_errs = []
-	for t, a in zip(true_vals, approx_vals):
-		ea = abs(t - a)
-		er = ea / abs(t) if t != 0 else float('inf')
-		abs_errs.append(ea)
-		rel_errs.append(er)
+
+import numpy as np
+
+from _common import NUMBA_MIN_SIZE, generate_noisy, load_compute_errors_kernel, load_lateral_displacement_ufunc, load_pyplot, save_figure
+
+# Resolución de los PNG generados por save_plots
+SAVE_DPI = 96
+
+# Directorios de salida ya creados en este proceso
+_MKDIR_CACHE = set()
+
+
+def _ensure_dir(out_dir: str):
+	# Evita repetir makedirs (stat/mkdir) si save_plots se llama varias veces
+	if out_dir not in _MKDIR_CACHE:
+		os.makedirs(out_dir, exist_ok=True)
+		_MKDIR_CACHE.add(out_dir)
+
+
+def compute_errors(true_vals: list[float], approx_vals: list[float]) -> tuple[np.ndarray, np.ndarray]:
+	t = np.asarray(true_vals, dtype=float)
+	a = np.asarray(approx_vals, dtype=float)
+	if t.ndim == 1 and t.shape == a.shape and t.size >= NUMBA_MIN_SIZE:
+		kernel = load_compute_errors_kernel()
+		if kernel is not None:
+			abs_errs = np.empty_like(t)
+			rel_errs = np.empty_like(t)
+			kernel(t, a, abs_errs, rel_errs)
+			return abs_errs, rel_errs
+	abs_errs = np.abs(t - a)
+	abs_t = np.abs(t)
+	# División directa (no producto por 1/|t|: el recíproco de un |t| subnormal
+	# desborda a inf); donde t == 0 queda el inf inicial
+	rel_errs = np.divide(abs_errs, abs_t, out=np.full_like(abs_t, np.inf), where=abs_t != 0)
 	return abs_errs, rel_errs
 
 
 def lateral_displacement(angle_deg: float, distance_m: float) -> float:
 	# Desplazamiento lateral en el objetivo a partir del ángulo de desviación
-	return distance_m * math.tan(math.radians(angle_deg))
+	if np.size(angle_deg) >= NUMBA_MIN_SIZE:
+		ufunc = load_lateral_displacement_ufunc()
+		if ufunc is not None:
+			return ufunc(angle_deg, distance_m)
+	return distance_m * np.tan(np.radians(angle_deg))
+
 
+def save_plots(records: dict[str, np.ndarray], out_dir: str):
+	plt = load_pyplot()
+	_ensure_dir(out_dir)
 
-def save_plots(records: List[Dict], out_dir: str):
-	os.makedirs(out_dir, exist_ok=True)
+	true_angles = records['true_angle']
+	meas_angles = records['measured_angle']
+	abs_errs = records['abs_err']
+	lat_true = records['lat_true']
+	lat_meas = records['lat_meas']
 
-	true_angles = [r['true_angle'] for r in records]
-	meas_angles = [r['measured_angle'] for r in records]
-	abs_errs = [r['abs_err'] for r in records]
-	lat_true = [r['lat_true'] for r in records]
-	lat_meas = [r['lat_meas'] for r in records]
+	# Una sola figura para todos los gráficos: se limpia el eje entre uno y otro
+	fig, ax = plt.subplots(figsize=(6, 4), dpi=SAVE_DPI)
+	# Márgenes fijos en lugar de tight_layout (evita una pasada extra de dibujo)
+	fig.subplots_adjust(left=0.12, right=0.97, top=0.90, bottom=0.17)
 
 	# Scatter: ángulo verdadero vs medido
-	fig1, ax1 = plt.subplots(figsize=(6, 4))
-	ax1.scatter(true_angles, meas_angles, color='tab:blue')
-	ax1.plot([min(true_angles), max(true_angles)], [min(true_angles), max(true_angles)], '--', color='gray')
-	ax1.set_xlabel('Ángulo verdadero (°)')
-	ax1.set_ylabel('Ángulo medido (°)')
-	ax1.set_title('Ángulo verdadero vs Ángulo medido')
-	fig1.tight_layout()
-	fig1.savefig(os.path.join(out_dir, 'angle_true_vs_meas.png'))
-	plt.close(fig1)
+	ax.plot(true_angles, meas_angles, 'o', color='tab:blue')
+	ax.plot([true_angles.min(), true_angles.max()], [true_angles.min(), true_angles.max()], '--', color='gray')
+	ax.set_xlabel('Ángulo verdadero (°)')
+	ax.set_ylabel('Ángulo medido (°)')
+	ax.set_title('Ángulo verdadero vs Ángulo medido')
+	save_figure(fig, os.path.join(out_dir, 'angle_true_vs_meas.png'))
 
 	# Error por disparo
-	fig2, ax2 = plt.subplots(figsize=(6, 3))
-	ax2.plot(range(1, len(abs_errs) + 1), abs_errs, marker='o')
-	ax2.set_xlabel('Disparo #')
-	ax2.set_ylabel('Error absoluto (°)')
-	ax2.set_title('Error absoluto por disparo')
-	fig2.tight_layout()
-	fig2.savefig(os.path.join(out_dir, 'abs_error_by_shot.png'))
-	plt.close(fig2)
+	ax.clear()
+	fig.set_size_inches(6, 3)
+	ax.plot(range(1, len(abs_errs) + 1), abs_errs, marker='o')
+	ax.set_xlabel('Disparo #')
+	ax.set_ylabel('Error absoluto (°)')
+	ax.set_title('Error absoluto por disparo')
+	save_figure(fig, os.path.join(out_dir, 'abs_error_by_shot.png'))
 
 	# Impactos en plano del blanco (latitud en m)
-	fig3, ax3 = plt.subplots(figsize=(6, 3))
-	ax3.axvline(0, color='gray', linestyle='--', label='Blanco (centro)')
-	ax3.scatter(lat_true, [0]*len(lat_true), marker='x', color='green', label='Esperado')
-	ax3.scatter(lat_meas, [0]*len(lat_meas), marker='o', color='red', label='Impactos medidos')
-	ax3.set_xlabel('Desplazamiento lateral (m)')
-	ax3.set_yticks([])
-	ax3.set_title('Impactos en el blanco (proyección lateral)')
-	ax3.legend()
-	fig3.tight_layout()
-	fig3.savefig(os.path.join(out_dir, 'impacts_plane.png'))
-	plt.close(fig3)
-
-
-def run_gui(records: List[Dict]):
-	if not TK_AVAILABLE:
+	ax.clear()
+	ax.axvline(0, color='gray', linestyle='--', label='Blanco (centro)')
+	ax.plot(lat_true, np.zeros_like(lat_true), 'x', color='green', label='Esperado')
+	ax.plot(lat_meas, np.zeros_like(lat_meas), 'o', color='red', label='Impactos medidos')
+	ax.set_xlabel('Desplazamiento lateral (m)')
+	ax.set_yticks([])
+	ax.set_title('Impactos en el blanco (proyección lateral)')
+	ax.legend()
+	save_figure(fig, os.path.join(out_dir, 'impacts_plane.png'))
+	plt.close(fig)
+
+
+def run_gui(records: dict[str, np.ndarray]):
+	try:
+		import tkinter as tk
+		from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+	except Exception:
 		print('tkinter no disponible; GUI no se puede mostrar.')
 		return
+	plt = load_pyplot()
 
-	lat_true = [r['lat_true'] for r in records]
-	lat_meas = [r['lat_meas'] for r in records]
+	lat_true = records['lat_true']
+	lat_meas = records['lat_meas']
 
 	root = tk.Tk()
 	root.title('Sistema de puntería - impactos')
 
 	fig, ax = plt.subplots(figsize=(6, 4))
 	ax.axvline(0, color='gray', linestyle='--')
-	ax.scatter(lat_true, [0]*len(lat_true), marker='x', color='green', label='Esperado')
-	ax.scatter(lat_meas, [0]*len(lat_meas), marker='o', color='red', label='Impactos')
+	ax.plot(lat_true, np.zeros_like(lat_true), 'x', color='green', label='Esperado')
+	ax.plot(lat_meas, np.zeros_like(lat_meas), 'o', color='red', label='Impactos')
 	ax.set_xlabel('Desplazamiento lateral (m)')
 	ax.set_yticks([])
 	ax.set_title('Impactos proyectados (lateral)')
@@ -126,7 +146,7 @@ def run_gui(records: List[Dict]):
 	canvas.draw()
 	canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
 
-	mean_abs = statistics.mean([r['abs_err'] for r in records])
+	mean_abs = float(records['abs_err'].mean())
 	lbl = tk.Label(root, text=f'Error absoluto medio: {mean_abs:.4f} °')
 	lbl.pack(side=tk.BOTTOM, fill=tk.X)
 
@@ -134,8 +154,6 @@ def run_gui(records: List[Dict]):
 
 
 def main(argv):
-	random.seed(123)
-
 	# Parámetros: distancia al blanco (m)
 	distance = 250.0
 
@@ -146,38 +164,40 @@ def main(argv):
 	bias = -0.2  # sesgo de calibración (°), por ejemplo deriva a la izquierda
 	sigma = 0.6  # desviación típica del tirador (°)
 
-	records: List[Dict] = []
-	for i, t in enumerate(true_angles, start=1):
-		measured = t + bias + random.gauss(0, sigma)
-		ea = abs(t - measured)
-		er = ea / abs(t) if t != 0 else float('inf')
-		lat_t = lateral_displacement(t, distance)
-		lat_m = lateral_displacement(measured, distance)
-		records.append({
-			'shot': i,
-			'true_angle': t,
-			'measured_angle': measured,
-			'abs_err': ea,
-			'rel_err': er,
-			'lat_true': lat_t,
-			'lat_meas': lat_m,
-		})
+	n = len(true_angles)
+	true_arr = np.asarray(true_angles)
+	measured_angles = generate_noisy(true_arr, bias, sigma, seed=123)
+	abs_errs, rel_errs = compute_errors(true_arr, measured_angles)
+
+	# Una columna por magnitud, un elemento por disparo
+	records: dict[str, np.ndarray] = {
+		'shot': np.arange(1, n + 1),
+		'true_angle': true_arr,
+		'measured_angle': measured_angles,
+		'abs_err': abs_errs,
+		'rel_err': rel_errs,
+		'lat_true': lateral_displacement(true_arr, distance),
+		'lat_meas': lateral_displacement(measured_angles, distance),
+	}
 
 	out_dir = os.path.join(os.path.dirname(__file__), 'output_ej3')
 	save_plots(records, out_dir)
 
-	abs_errs = [r['abs_err'] for r in records]
-	rel_errs = [r['rel_err'] for r in records]
-	print('\nResumen Ejemplo 3 - Sistema de puntería')
-	print('------------------------------------')
-	print(f'Tiros: {len(records)}')
-	print(f'Error absoluto medio: {statistics.mean(abs_errs):.4f} °')
-	print(f'Error absoluto máximo: {max(abs_errs):.4f} °')
-	print(f'Error relativo medio: {statistics.mean(rel_errs) * 100:.4f} %')
-	print('\nTabla de resultados:')
-	print('i | ang_true(°) | ang_meas(°) | err_abs(°) | err_rel(%) | lat_true(m) | lat_meas(m)')
-	for r in records:
-		print(f"{r['shot']:2d} | {r['true_angle']:11.3f} | {r['measured_angle']:11.3f} | {r['abs_err']:9.4f} | {r['rel_err']*100:9.4f} | {r['lat_true']:10.3f} | {r['lat_meas']:10.3f}")
+	# Encabezado y estadísticas en una sola escritura
+	lines = [
+		'\nResumen Ejemplo 3 - Sistema de puntería',
+		'------------------------------------',
+		f'Tiros: {n}',
+		f'Error absoluto medio: {float(abs_errs.mean()):.4f} °',
+		f'Error absoluto máximo: {float(abs_errs.max()):.4f} °',
+		f'Error relativo medio: {float(rel_errs.mean()) * 100:.4f} %',
+		'\nTabla de resultados:',
+		'i | ang_true(°) | ang_meas(°) | err_abs(°) | err_rel(%) | lat_true(m) | lat_meas(m)',
+	]
+	sys.stdout.write('\n'.join(lines) + '\n')
+	# Filas de la tabla: un solo np.savetxt en lugar de formatear fila por fila
+	table = np.column_stack([records['shot'], records['true_angle'], records['measured_angle'], abs_errs, rel_errs * 100, records['lat_true'], records['lat_meas']])
+	np.savetxt(sys.stdout, table, fmt='%2d | %11.3f | %11.3f | %9.4f | %9.4f | %10.3f | %10.3f')
 
 	if '--gui' in argv:
 		run_gui(records)
@@ -0,0 +1,108 @@
+"""
+Utilidades compartidas por los ejemplos de la Tarea 1.
+
+- generate_noisy: simula mediciones (valor verdadero + sesgo + ruido gaussiano)
+- load_pyplot: importa y configura matplotlib (una sola vez, bajo demanda)
+- load_compute_errors_kernel: kernel Numba de compute_errors (bajo demanda)
+- load_lateral_displacement_ufunc: ufunc Numba de lateral_displacement (bajo demanda)
+- save_figure: guarda una figura de matplotlib como PNG
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+_PYPLOT = None
+
+# Por debajo de este tamaño el costo de importar numba y cargar el kernel JIT no compensa
+NUMBA_MIN_SIZE = 10_000
+
+# None: aún no se intentó cargar; False: numba no está disponible
+_COMPUTE_ERRORS_KERNEL = None
+_LATERAL_DISPLACEMENT_UFUNC = None
+
+
+def generate_noisy(true_vals: list[float], bias: float, sigma: float, seed: int) -> np.ndarray:
+	# Un único Generator por llamada: todo el ruido se genera en un solo paso
+	rng = np.random.default_rng(seed)
+	t = np.asarray(true_vals, dtype=float)
+	return t + bias + rng.normal(0, sigma, size=t.shape)
+
+
+def load_pyplot():
+	# Importación diferida: matplotlib solo se carga cuando hay que graficar.
+	# La primera vez se fija la fuente y el estilo para que la búsqueda de
+	# fuentes del FontManager se haga una única vez por proceso.
+	global _PYPLOT
+	if _PYPLOT is None:
+		import matplotlib
+		matplotlib.use('Agg')  # por defecto generar archivos (no bloquear)
+		import matplotlib.pyplot as plt
+		from matplotlib import font_manager
+		plt.rcParams.update({
+			'font.family': 'DejaVu Sans',
+			'axes.unicode_minus': False,
+			'figure.autolayout': False,
+		})
+		font_manager.fontManager.findfont('DejaVu Sans')
+		_PYPLOT = plt
+	return _PYPLOT
+
+
+def load_compute_errors_kernel():
+	# Importación diferida de numba: solo se paga cuando compute_errors recibe
+	# arreglos grandes. Devuelve None si numba no está instalado.
+	global _COMPUTE_ERRORS_KERNEL
+	if _COMPUTE_ERRORS_KERNEL is None:
+		try:
+			from numba import njit
+		except Exception:
+			_COMPUTE_ERRORS_KERNEL = False
+			return None
+
+		# Sin 'nnan'/'ninf': el kernel debe poder producir inf cuando t == 0.
+		# Sin 'arcp': d * (1/|t|) desborda a inf si |t| es subnormal.
+		@njit(fastmath={'nsz', 'contract', 'afn', 'reassoc'}, error_model='numpy', cache=True)
+		def _compute_errors_kernel(t, a, ea, er):
+			n = t.shape[0]
+			# Bucle principal sin ramas (vectorizable)
+			for i in range(n):
+				d = abs(t[i] - a[i])
+				ea[i] = d
+				er[i] = d / abs(t[i])
+			# Los t == 0 se corrigen aparte para no ramificar el bucle principal
+			for i in range(n):
+				if t[i] == 0:
+					er[i] = np.inf
+
+		_COMPUTE_ERRORS_KERNEL = _compute_errors_kernel
+	return _COMPUTE_ERRORS_KERNEL or None
+
+
+def load_lateral_displacement_ufunc():
+	# Igual que load_compute_errors_kernel: la ufunc se compila (o se carga del
+	# caché) solo cuando se necesita. Devuelve None si numba no está instalado.
+	global _LATERAL_DISPLACEMENT_UFUNC
+	if _LATERAL_DISPLACEMENT_UFUNC is None:
+		try:
+			from numba import vectorize, float64
+		except Exception:
+			_LATERAL_DISPLACEMENT_UFUNC = False
+			return None
+		import math
+
+		@vectorize([float64(float64, float64)], fastmath=True, cache=True)
+		def _lateral_displacement(angle_deg, distance_m):
+			return distance_m * math.tan(math.radians(angle_deg))
+
+		_LATERAL_DISPLACEMENT_UFUNC = _lateral_displacement
+	return _LATERAL_DISPLACEMENT_UFUNC or None
+
+
+def save_figure(fig, path: str):
+	# Escribe el PNG directamente desde el buffer Agg (sin pasar por savefig).
+	# Pillow es dependencia obligatoria de matplotlib, así que siempre está.
+	from PIL import Image
+	fig.canvas.draw()
+	buf = np.asarray(fig.canvas.buffer_rgba())
+	Image.fromarray(buf).save(path, dpi=(fig.dpi, fig.dpi), optimize=False, compress_level=1)